@@ -171,9 +171,19 @@ class FBRefScraper:
         return df
 
 class ReportGenerator:
-    def __init__(self, full_df):
+    def __init__(self, full_df, ci_df=None):
         self.df = full_df
         self.avg_stats = full_df.mean(numeric_only=True)
+        # Bootstrap CIs (scripts/statsbomb_bootstrap_ci.py), keyed by (Team, Metric)
+        self.ci = ci_df.set_index(['Team', 'Metric']) if ci_df is not None else None
+
+    def confidence_flag(self, team_name, metric):
+        if self.ci is None or (team_name, metric) not in self.ci.index:
+            return ""
+        row = self.ci.loc[(team_name, metric)]
+        if not row['Low_Confidence']:
+            return ""
+        return f" _(baja confianza: IC95% {row['CI_Low']:.3g}–{row['CI_High']:.3g}, {int(row['Matches'])} partidos)_"
 
     def generate_style_summary(self, team_name):
         team_data = self.df[self.df['Team'] == team_name].iloc[0]
@@ -212,22 +222,22 @@ class ReportGenerator:
         # StatsBomb-derived (if available)
         if 'Pass_Completion' in team_data:
             rel_pc = (team_data['Pass_Completion'] / self.avg_stats['Pass_Completion'] - 1) * 100
-            bullets.append(f"- **Calidad de Pase**: Su % de pase completo está {rel_pc:+.1f}% vs media.")
+            bullets.append(f"- **Calidad de Pase**: Su % de pase completo está {rel_pc:+.1f}% vs media.{self.confidence_flag(team_name, 'Pass_Completion')}")
         if 'Possession_Share' in team_data:
             rel_poss = (team_data['Possession_Share'] / self.avg_stats['Possession_Share'] - 1) * 100
-            bullets.append(f"- **Control de la Posesión**: Su cuota de posesión está {rel_poss:+.1f}% vs media.")
+            bullets.append(f"- **Control de la Posesión**: Su cuota de posesión está {rel_poss:+.1f}% vs media.{self.confidence_flag(team_name, 'Possession_Share')}")
         if 'Progressive_Passes_per_match' in team_data:
             rel_prog = (team_data['Progressive_Passes_per_match'] / self.avg_stats['Progressive_Passes_per_match'] - 1) * 100
-            bullets.append(f"- **Progresión por Pase**: Sus pases progresivos por partido están {rel_prog:+.1f}% vs media.")
+            bullets.append(f"- **Progresión por Pase**: Sus pases progresivos por partido están {rel_prog:+.1f}% vs media.{self.confidence_flag(team_name, 'Progressive_Passes_per_match')}")
         if 'Progressive_Carries_per_match' in team_data:
             rel_prog_c = (team_data['Progressive_Carries_per_match'] / self.avg_stats['Progressive_Carries_per_match'] - 1) * 100
-            bullets.append(f"- **Progresión por Conducción**: Sus conducciones progresivas por partido están {rel_prog_c:+.1f}% vs media.")
+            bullets.append(f"- **Progresión por Conducción**: Sus conducciones progresivas por partido están {rel_prog_c:+.1f}% vs media.{self.confidence_flag(team_name, 'Progressive_Carries_per_match')}")
         if 'FinalThird_Entries_per_match' in team_data:
             rel_f3 = (team_data['FinalThird_Entries_per_match'] / self.avg_stats['FinalThird_Entries_per_match'] - 1) * 100
-            bullets.append(f"- **Territorio (3er tercio)**: Entradas al 3er tercio {rel_f3:+.1f}% vs media.")
+            bullets.append(f"- **Territorio (3er tercio)**: Entradas al 3er tercio {rel_f3:+.1f}% vs media.{self.confidence_flag(team_name, 'FinalThird_Entries_per_match')}")
         if 'Box_Entries_per_match' in team_data:
             rel_box = (team_data['Box_Entries_per_match'] / self.avg_stats['Box_Entries_per_match'] - 1) * 100
-            bullets.append(f"- **Amenaza en Área**: Entradas al área {rel_box:+.1f}% vs media.")
+            bullets.append(f"- **Amenaza en Área**: Entradas al área {rel_box:+.1f}% vs media.{self.confidence_flag(team_name, 'Box_Entries_per_match')}")
             
         return "\n".join(bullets)
 
@@ -238,13 +248,13 @@ class ReportGenerator:
         if 'Pass_Completion' in team_data and 'Passes_per_match' in team_data:
             bullets.append(f"- **Control con balón**: Completa {team_data['Pass_Completion']:.2%} de sus pases con {team_data['Passes_per_match']:.1f} pases por partido.")
         if 'Possession_Share' in team_data:
-            bullets.append(f"- **Dominio posicional**: Su cuota de posesión estimada es {team_data['Possession_Share']:.2%}.")
+            bullets.append(f"- **Dominio posicional**: Su cuota de posesión estimada es {team_data['Possession_Share']:.2%}.{self.confidence_flag(team_name, 'Possession_Share')}")
         if 'Pass_Completion' in team_data and 'Possession_Share' in team_data:
             bullets.append(f"- **Ritmo y seguridad**: Prioriza circulación segura para sostener el control territorial.")
         if 'FinalThird_Entries_per_match' in team_data:
-            bullets.append(f"- **Ocupación de zonas**: Genera {team_data['FinalThird_Entries_per_match']:.1f} entradas al último tercio por partido.")
+            bullets.append(f"- **Ocupación de zonas**: Genera {team_data['FinalThird_Entries_per_match']:.1f} entradas al último tercio por partido.{self.confidence_flag(team_name, 'FinalThird_Entries_per_match')}")
         if 'Box_Entries_per_match' in team_data:
-            bullets.append(f"- **Amenaza estructurada**: Suma {team_data['Box_Entries_per_match']:.1f} entradas al área por partido.")
+            bullets.append(f"- **Amenaza estructurada**: Suma {team_data['Box_Entries_per_match']:.1f} entradas al área por partido.{self.confidence_flag(team_name, 'Box_Entries_per_match')}")
         if 'FinalThird_Entries_per_match' in team_data and 'Box_Entries_per_match' in team_data:
             ratio = team_data['Box_Entries_per_match'] / team_data['FinalThird_Entries_per_match'] if team_data['FinalThird_Entries_per_match'] else 0
             bullets.append(f"- **Paciencia en el último tercio**: Convierte el {ratio:.1%} de entradas al último tercio en entradas al área.")
@@ -260,7 +270,11 @@ class ReportGenerator:
         if 'Pressures_per_match' in team_data and 'Interceptions_per_match' in team_data:
             bullets.append(f"- **Rest defense**: Combina {team_data['Pressures_per_match']:.1f} presiones con {team_data['Interceptions_per_match']:.1f} intercepciones por partido para sostener ataques largos.")
         if 'xG_per_shot' in team_data:
-            bullets.append(f"- **Calidad de tiro**: xG por disparo de {team_data['xG_per_shot']:.3f}.")
+            bullets.append(f"- **Calidad de tiro**: xG por disparo de {team_data['xG_per_shot']:.3f}.{self.confidence_flag(team_name, 'xG_per_shot')}")
+        if 'PPDA' in team_data:
+            bullets.append(f"- **Intensidad de presión (PPDA, proxy)**: Permite {team_data['PPDA']:.1f} pases rivales en su 60% de campo por entrada, intercepción o falta en esa zona.{self.confidence_flag(team_name, 'PPDA')}")
+        if 'Shots_Against_per_match' in team_data and 'xGA_per_match' in team_data:
+            bullets.append(f"- **Control sin balón**: Concede {team_data['Shots_Against_per_match']:.1f} tiros y {team_data['xGA_per_match']:.2f} xG por partido.")
 
         return "\n".join(bullets)
 
@@ -277,10 +291,12 @@ class ReportGenerator:
             insights.append(f"1. **Estilo Mixto**: El equipo mantiene un equilibrio entre posesión y progresión vertical.")
 
         # Insight 2: Weakness relative point
-        if 'Expected_xGA' in team_data.index and 'Expected_xGA' in self.avg_stats.index and team_data['Expected_xGA'] > self.avg_stats['Expected_xGA']:
-            insights.append(f"2. **Vulnerabilidad Defensiva**: Pese a su ataque, concede un xG en contra elevado ({team_data['Expected_xGA']:.2f}), sugiriendo riesgos en transiciones.")
+        # FBref exposes Expected_xGA; the StatsBomb path produces xGA_per_match
+        xga_col = 'Expected_xGA' if 'Expected_xGA' in team_data.index else 'xGA_per_match'
+        if xga_col in team_data.index and xga_col in self.avg_stats.index and team_data[xga_col] > self.avg_stats[xga_col]:
+            insights.append(f"2. **Vulnerabilidad Defensiva**: Pese a su ataque, concede un xG en contra elevado ({team_data[xga_col]:.2f}), sugiriendo riesgos en transiciones.{self.confidence_flag(team_name, xga_col)}")
         else:
-            insights.append(f"2. **Solidez Estructural**: Logra mantener un xGA por debajo de la media, validando su sistema defensivo.")
+            insights.append(f"2. **Solidez Estructural**: Logra mantener un xGA por debajo de la media, validando su sistema defensivo.{self.confidence_flag(team_name, xga_col)}")
 
         # Insight 3: Key Driver
         if 'Passing_PrgDist' in team_data:
@@ -299,11 +315,19 @@ def load_statsbomb_team_stats():
         return df
     return None
 
+def load_statsbomb_team_ci():
+    ci_csv = Path("statsbomb_team_ci.csv")
+    if ci_csv.exists():
+        return pd.read_csv(ci_csv)
+    return None
+
 def main():
+    ci_df = None
     # Prefer local StatsBomb-derived dataset if available
     statsbomb_df = load_statsbomb_team_stats()
     if statsbomb_df is not None and not statsbomb_df.empty:
         final_df = statsbomb_df
+        ci_df = load_statsbomb_team_ci()
     else:
         # Check if we should load local data if scraping fails
         try:
@@ -341,7 +365,7 @@ def main():
         target_data.to_csv("flick_scout_top_teams.csv", index=False)
     
     # Reporting
-    reporter = ReportGenerator(final_df)
+    reporter = ReportGenerator(final_df, ci_df)
     
     if "Barcelona" in target_data['Team'].values:
         print("\n=== FLICKLENS REPORT: FC BARCELONA ===")
@@ -5,6 +5,9 @@ from collections import Counter, defaultdict
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from statsbomb_decode import load_events, load_lineups
+from statsbomb_team_report import events_end_minute, spell_minutes
+
 BASE = Path('data/statsbomb_open_data')
 LINEUPS_DIR = BASE / 'lineups'
 EVENTS_DIR = BASE / 'events'
@@ -32,37 +35,7 @@ def match_end_minute(match_id):
     events_path = EVENTS_DIR / f"{match_id}.json"
     if not events_path.exists():
         return 90.0
-    events = load_json(events_path)
-    max_min = 90.0
-    for ev in events:
-        minute = ev.get('minute')
-        second = ev.get('second', 0)
-        if minute is None:
-            continue
-        t = float(minute) + (float(second) / 60.0)
-        if t > max_min:
-            max_min = t
-    return max_min
-
-def parse_time(value, fallback=0.0):
-    if value is None:
-        return fallback
-    if isinstance(value, (int, float)):
-        return float(value)
-    if isinstance(value, str):
-        if ':' in value:
-            parts = value.split(':')
-            try:
-                mins = float(parts[0])
-                secs = float(parts[1]) if len(parts) > 1 else 0.0
-                return mins + (secs / 60.0)
-            except ValueError:
-                return fallback
-        try:
-            return float(value)
-        except ValueError:
-            return fallback
-    return fallback
+    return events_end_minute(load_events(events_path))
 
 
 def collect_players(match_ids):
@@ -73,27 +46,20 @@ def collect_players(match_ids):
         lp = LINEUPS_DIR / f"{mid}.json"
         if not lp.exists():
             continue
-        data = load_json(lp)
+        data = load_lineups(lp)
         end_min = match_end_minute(mid)
 
         for team_entry in data:
-            team_name = team_entry.get('team_name')
+            team_name = team_entry.team_name
             if team_name not in TEAM_NAMES:
                 continue
-            for p in team_entry.get('lineup', []):
-                name = p.get('player_name')
+            for p in team_entry.lineup or []:
+                name = p.player_name
                 if not name:
                     continue
                 appearances[name] += 1
                 # Positions provide from/to minutes
-                total_minutes = 0.0
-                for pos in p.get('positions', []):
-                    start = parse_time(pos.get('from', 0), 0.0)
-                    end = parse_time(pos.get('to'), None)
-                    if end is None:
-                        end = end_min
-                    total_minutes += max(0.0, float(end) - float(start))
-                minutes[name] += total_minutes
+                minutes[name] += spell_minutes(p.positions, end_min)
 
     return appearances, minutes
 
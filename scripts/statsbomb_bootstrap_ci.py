@@ -0,0 +1,103 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import time
+import numpy as np
+import pandas as pd
+
+from statsbomb_team_report import (
+    MATCH_STATS_CSV, add_derived_metrics, build_match_stats, collect_match_ids,
+    normalize_name,
+)
+
+OUT_CSV = Path('statsbomb_team_ci.csv')
+
+# A claim is flagged as low confidence below this many matches or when the
+# CI is wider than this fraction of the point estimate.
+MIN_MATCHES = 3
+MAX_REL_WIDTH = 0.3
+
+
+def load_match_stats():
+    if MATCH_STATS_CSV.exists():
+        return pd.read_csv(MATCH_STATS_CSV)
+    return build_match_stats(collect_match_ids())
+
+
+def bootstrap_team(team, counters, columns, n_boot, alpha, seed):
+    """Resample one team's matches n_boot times and return CI rows for the
+    rates and ratios add_derived_metrics reports (raw counters are dropped).
+
+    Each resample is a multinomial weight vector over the team's matches, so
+    all resampled totals are a single (n_boot x matches) @ (matches x counters)
+    product; the derived metrics are then computed column-wise on the result.
+    """
+    n = counters.shape[0]
+    rng = np.random.default_rng(seed)
+    weights = rng.multinomial(n, np.full(n, 1.0 / n), size=n_boot)
+    sums = pd.DataFrame(weights @ counters, columns=columns)
+    point = pd.DataFrame(counters.sum(axis=0, keepdims=True), columns=columns)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        boot = add_derived_metrics(sums).drop(columns=columns).replace([np.inf, -np.inf], np.nan)
+        point = add_derived_metrics(point).drop(columns=columns).replace([np.inf, -np.inf], np.nan)
+
+    lo, hi = np.nanquantile(boot.to_numpy(dtype=float), [alpha / 2, 1 - alpha / 2], axis=0)
+    estimate = point.iloc[0].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rel_width = np.where(hi == lo, 0.0, (hi - lo) / np.abs(estimate))
+
+    return pd.DataFrame({
+        'Team': team,
+        'Metric': boot.columns,
+        'Matches': n,
+        'Estimate': estimate,
+        'CI_Low': lo,
+        'CI_High': hi,
+        'Rel_Width': rel_width,
+    })
+
+
+def bootstrap_ci(match_df, n_boot=5000, alpha=0.05, seed=0, workers=1):
+    """Percentile bootstrap CIs for every team metric from per-match partials."""
+    columns = [c for c in match_df.select_dtypes('number').columns if c != 'Match_Id']
+    jobs = []
+    for i, (team, g) in enumerate(match_df.groupby('Team', sort=True)):
+        jobs.append((team, g[columns].to_numpy(dtype=float), columns, n_boot, alpha, seed + i))
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(bootstrap_team, *zip(*jobs)))
+    else:
+        parts = [bootstrap_team(*job) for job in jobs]
+
+    out = pd.concat(parts, ignore_index=True)
+    out['Low_Confidence'] = (out['Matches'] < MIN_MATCHES) | ~(out['Rel_Width'] <= MAX_REL_WIDTH)
+    out['Team_Normalized'] = out['Team'].apply(normalize_name)
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bootstrap CIs for team metrics from per-match partials.")
+    parser.add_argument("--resamples", type=int, default=5000, help="Bootstrap resamples per team")
+    parser.add_argument("--alpha", type=float, default=0.05, help="1 - confidence level")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--workers", type=int, default=1, help="Process pool size (1 = in-process)")
+    parser.add_argument("--out", default=str(OUT_CSV), help="Output CSV")
+    args = parser.parse_args()
+
+    match_df = load_match_stats()
+    if match_df.empty:
+        print('No data found in events.')
+        return
+
+    start = time.perf_counter()
+    df = bootstrap_ci(match_df, args.resamples, args.alpha, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+    df.to_csv(args.out, index=False)
+    print(f'Saved {args.out} ({df["Team"].nunique()} teams x {df["Metric"].nunique()} metrics, '
+          f'{args.resamples} resamples in {elapsed:.2f}s)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""Typed decoding of StatsBomb event and lineup files.
+
+With msgspec installed, files decode straight into structs holding only the
+fields the pipeline reads (everything else is skipped by the decoder).
+Without it, stdlib json decodes each object into a plain record read by
+attribute, so callers use ``ev.type.name`` / ``ev.pass_.end_location`` the
+same way either way. Missing fields are None in both cases.
+``decode_event`` decodes a single event, e.g. one line of a live feed.
+"""
+import gc
+import json
+from pathlib import Path
+from typing import List, Optional
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+if msgspec is not None:
+    class Named(msgspec.Struct, gc=False):
+        name: Optional[str] = None
+
+    class Pass(msgspec.Struct, gc=False):
+        end_location: Optional[List[float]] = None
+        outcome: Optional[Named] = None
+
+    class Shot(msgspec.Struct, gc=False):
+        outcome: Optional[Named] = None
+        statsbomb_xg: Optional[float] = None
+
+    class Carry(msgspec.Struct, gc=False):
+        end_location: Optional[List[float]] = None
+
+    class Dribble(msgspec.Struct, gc=False):
+        outcome: Optional[Named] = None
+
+    class Duel(msgspec.Struct, gc=False):
+        type: Optional[Named] = None
+
+    class TacticsPlayer(msgspec.Struct, gc=False):
+        player: Optional[Named] = None
+
+    class Tactics(msgspec.Struct, gc=False):
+        lineup: List[TacticsPlayer] = []
+
+    class Substitution(msgspec.Struct, gc=False):
+        replacement: Optional[Named] = None
+
+    class Booking(msgspec.Struct, gc=False):
+        card: Optional[Named] = None
+
+    class Event(msgspec.Struct, gc=False):
+        type: Optional[Named] = None
+        team: Optional[Named] = None
+        player: Optional[Named] = None
+        period: Optional[int] = None
+        timestamp: Optional[str] = None
+        minute: Optional[int] = None
+        second: Optional[int] = None
+        location: Optional[List[float]] = None
+        duration: Optional[float] = None
+        pass_: Optional[Pass] = msgspec.field(default=None, name='pass')
+        shot: Optional[Shot] = None
+        carry: Optional[Carry] = None
+        dribble: Optional[Dribble] = None
+        duel: Optional[Duel] = None
+        tactics: Optional[Tactics] = None
+        substitution: Optional[Substitution] = None
+        foul_committed: Optional[Booking] = None
+        bad_behaviour: Optional[Booking] = None
+
+    class Position(msgspec.Struct, gc=False):
+        from_: Optional[str] = msgspec.field(default=None, name='from')
+        to: Optional[str] = None
+
+    class LineupPlayer(msgspec.Struct, gc=False):
+        player_name: Optional[str] = None
+        positions: List[Position] = []
+
+    class Lineup(msgspec.Struct, gc=False):
+        team_name: Optional[str] = None
+        lineup: List[LineupPlayer] = []
+
+    _events_decoder = msgspec.json.Decoder(List[Event])
+    _lineups_decoder = msgspec.json.Decoder(List[Lineup])
+    _event_decoder = msgspec.json.Decoder(Event)
+
+    def load_events(path: Path):
+        return _events_decoder.decode(path.read_bytes())
+
+    def load_lineups(path: Path):
+        return _lineups_decoder.decode(path.read_bytes())
+
+    def decode_event(line):
+        return _event_decoder.decode(line)
+
+else:
+    class _Record:
+        """Decoded JSON object read by attribute; absent fields fall back to None."""
+        type = team = player = period = timestamp = minute = second = None
+        location = duration = pass_ = shot = carry = dribble = duel = None
+        tactics = substitution = foul_committed = bad_behaviour = None
+        outcome = end_location = statsbomb_xg = replacement = card = name = None
+        team_name = player_name = from_ = to = None
+        lineup = positions = ()
+
+    def _record(data):
+        # Adopt the decoded dict as the instance namespace (no copy);
+        # JSON keys that are Python keywords get a trailing underscore.
+        rec = _Record.__new__(_Record)
+        if 'pass' in data:
+            data['pass_'] = data['pass']
+        if 'from' in data:
+            data['from_'] = data['from']
+        rec.__dict__ = data
+        return rec
+
+    def _load(path: Path):
+        # Hundreds of thousands of small objects per match would otherwise
+        # trigger repeated cyclic-GC passes mid-decode.
+        was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return json.loads(path.read_text(encoding='utf-8'), object_hook=_record)
+        finally:
+            if was_enabled:
+                gc.enable()
+
+    load_events = _load
+    load_lineups = _load
+
+    def decode_event(line):
+        return json.loads(line, object_hook=_record)
@@ -0,0 +1,305 @@
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+import pandas as pd
+
+from statsbomb_decode import decode_event, load_events, load_lineups
+from statsbomb_team_report import (
+    EVENTS_DIR, LINEUPS_DIR, aggregate_team_stats, event_minute, match_rows,
+    spell_minutes, update_team_counters,
+)
+
+OUT_TEAM_CSV = Path('live_team_stats.csv')
+OUT_PLAYER_CSV = Path('live_player_minutes.csv')
+
+SENT_OFF = {'Red Card', 'Second Yellow'}
+
+
+def parse_timestamp(value):
+    """'HH:MM:SS.mmm' (time since the start of the period) to minutes."""
+    hours, mins, secs = value.split(':')
+    return int(hours) * 60.0 + int(mins) + float(secs) / 60.0
+
+
+class MatchClock:
+    """Elapsed playing time in minutes, from each event's (period, timestamp).
+
+    StatsBomb timestamps restart at zero every period, and the minute field
+    restarts at 45/90/105 regardless of stoppage time, so neither is monotonic
+    across periods on its own. Each period is offset by the length of the
+    periods before it (their last timestamp); breaks between periods count
+    as zero. Events without a period or timestamp read the current time.
+    """
+
+    def __init__(self):
+        self.period = None
+        self.offset = 0.0  # minutes played in finished periods
+        self.period_end = 0.0  # latest timestamp seen in the current period
+        self.now = 0.0
+
+    def update(self, ev):
+        """Advance the clock with ev and return the event's own time."""
+        if ev.period is None or not ev.timestamp:
+            return self.now
+        if ev.period != self.period:
+            if self.period is not None:
+                self.offset += self.period_end
+            self.period = ev.period
+            self.period_end = 0.0
+        t = parse_timestamp(ev.timestamp)
+        self.period_end = max(self.period_end, t)
+        self.now = max(self.now, self.offset + t)
+        return self.offset + t
+
+
+class LiveMatch:
+    """Incremental team counters and player minutes for one match in progress.
+
+    Each event is applied once through update_team_counters, the same per-event
+    step build_match_stats uses, so a finished replay matches the batch output.
+    Minutes come from Starting XI / Substitution / sending-off events instead
+    of the lineup file, whose position spells are only complete after the match.
+    They are measured on the StatsBomb minute clock, like spell_minutes, so a
+    finished match gives the collect_players totals (see compare_lineup_minutes);
+    as there, first-half stoppage time is not counted for players on at
+    half-time, and their running total steps back to 45 when the second half
+    kicks off. The one deliberate difference: a sending-off ends the spell
+    here, while the lineup file keeps the player on until the final whistle.
+    MatchClock (stoppage time included) drives only the displayed clock.
+    """
+
+    def __init__(self, match_id):
+        self.match_id = match_id
+        self.team_stats = {}
+        self.total_duration = 0.0
+        self.match_clock = MatchClock()
+        self.period = None
+        self.minute = 0.0  # latest StatsBomb minute in the current period
+        self.events = 0
+        self.on_pitch = {}  # (team, player) -> minute they came on
+        self.minutes = {}  # (team, player) -> minutes from finished spells
+
+    def update(self, ev):
+        self.total_duration += update_team_counters(self.team_stats, ev, self.match_id)
+        self.match_clock.update(ev)
+        minute = event_minute(ev)
+        if minute is None:
+            minute = self.minute
+        elif ev.period != self.period:
+            self.period = ev.period
+            self.minute = minute
+        else:
+            self.minute = max(self.minute, minute)
+        self.events += 1
+
+        etype = ev.type.name if ev.type is not None else None
+        team = ev.team.name if ev.team is not None else None
+        if etype == 'Starting XI' and ev.tactics is not None:
+            for p in ev.tactics.lineup:
+                if p.player is not None:
+                    self._on(team, p.player.name, 0.0)
+        elif etype == 'Substitution' and ev.player is not None:
+            self._off(team, ev.player.name, minute)
+            if ev.substitution is not None and ev.substitution.replacement is not None:
+                self._on(team, ev.substitution.replacement.name, minute)
+        elif etype == 'Player Off' and ev.player is not None:
+            self._off(team, ev.player.name, minute)
+        elif etype == 'Player On' and ev.player is not None:
+            self._on(team, ev.player.name, minute)
+        elif etype in ('Foul Committed', 'Bad Behaviour') and ev.player is not None:
+            booking = ev.foul_committed if etype == 'Foul Committed' else ev.bad_behaviour
+            if booking is not None and booking.card is not None and booking.card.name in SENT_OFF:
+                self._off(team, ev.player.name, minute)
+
+    @property
+    def clock(self):
+        return self.match_clock.now
+
+    def _on(self, team, player, minute):
+        self.on_pitch[(team, player)] = minute
+        self.minutes.setdefault((team, player), 0.0)
+
+    def _off(self, team, player, minute):
+        start = self.on_pitch.pop((team, player), None)
+        if start is not None:
+            self.minutes[(team, player)] += max(0.0, minute - start)
+
+    def team_metrics(self):
+        rows = match_rows(self.team_stats, self.match_id, self.total_duration)
+        return aggregate_team_stats(pd.DataFrame(rows))
+
+    def player_minutes(self):
+        rows = []
+        for (team, player), mins in self.minutes.items():
+            start = self.on_pitch.get((team, player))
+            if start is not None:
+                mins += max(0.0, self.minute - start)
+            rows.append({'Team': team, 'Player': player, 'Minutes': mins,
+                         'On_Pitch': start is not None})
+        return pd.DataFrame(rows)
+
+
+def compare_lineup_minutes(match, tolerance=0.01):
+    """Players whose live minutes differ from spell_minutes over the lineup file.
+
+    Run once the match has ended; returns None when no lineup file exists.
+    Open spells end at the last event minute (at least 90), as in
+    events_end_minute.
+    """
+    path = LINEUPS_DIR / f"{match.match_id}.json"
+    if not path.exists():
+        return None
+    live = match.player_minutes()
+    live = {} if live.empty else live.set_index(['Team', 'Player'])['Minutes'].to_dict()
+    end_min = max(90.0, match.minute)
+    rows = []
+    for team_entry in load_lineups(path):
+        for p in team_entry.lineup or []:
+            key = (team_entry.team_name, p.player_name)
+            lineup = spell_minutes(p.positions, end_min)
+            if abs(lineup - live.get(key, 0.0)) > tolerance:
+                rows.append({'Team': key[0], 'Player': key[1],
+                             'Live_Minutes': live.get(key, 0.0), 'Lineup_Minutes': lineup})
+    return pd.DataFrame(rows, columns=['Team', 'Player', 'Live_Minutes', 'Lineup_Minutes'])
+
+
+def follow_jsonl(path: Path, poll=0.05, idle_timeout=None):
+    """Yield events from a JSON-lines file, then keep waiting for appended ones.
+
+    Every line is decoded exactly once; a partially written last line is held
+    back until its newline arrives, and a malformed one is reported and skipped.
+    While waiting, None is yielded after every poll so the caller can flush.
+    """
+    while not path.exists():
+        time.sleep(poll)
+    with path.open('rb') as f:
+        pending = b''
+        last_data = time.monotonic()
+        while True:
+            chunk = f.readline()
+            if chunk:
+                pending += chunk
+                if pending.endswith(b'\n'):
+                    line = pending.strip()
+                    pending = b''
+                    if line:
+                        try:
+                            ev = decode_event(line)
+                        except ValueError as e:
+                            print(f'Skipping malformed line ({e}): {line[:200]!r}',
+                                  file=sys.stderr, flush=True)
+                        else:
+                            yield ev
+                    last_data = time.monotonic()
+                continue
+            if idle_timeout is not None and time.monotonic() - last_data > idle_timeout:
+                return
+            time.sleep(poll)
+            yield None
+
+
+def replay_events(match_id, speed=1.0, poll=0.05):
+    """Yield a stored match's events paced by MatchClock (speed x real time).
+
+    Periods play back to back: the break between them is not replayed.
+    As in follow_jsonl, None is yielded every poll seconds while waiting.
+    """
+    events = load_events(EVENTS_DIR / f"{match_id}.json")
+    clock = MatchClock()
+    start_wall = time.monotonic()
+    for ev in events:
+        clock.update(ev)
+        if speed > 0:
+            due = start_wall + clock.now * 60.0 / speed
+            while (delay := due - time.monotonic()) > 0:
+                time.sleep(min(delay, poll))
+                yield None
+        yield ev
+
+
+def write_atomic(df, path: Path):
+    tmp = path.with_suffix(path.suffix + '.tmp')
+    df.to_csv(tmp, index=False)
+    os.replace(tmp, path)
+
+
+def publish(match, team_out, player_out, received=None):
+    """Write the current team metrics and player minutes; received is the
+    monotonic arrival time of the oldest unpublished event, used to report
+    latency."""
+    teams = match.team_metrics()
+    if teams.empty:
+        return
+    write_atomic(teams, team_out)
+    write_atomic(match.player_minutes(), player_out)
+
+    summary = ' | '.join(
+        f"{r.Team}: {r.Goals} G, {r.xG:.2f} xG, {r.Shots} sh, {r.Possession_Share:.0%} pos"
+        for r in teams.itertuples()
+    )
+    lag = f' ({(time.monotonic() - received) * 1000:.0f} ms)' if received is not None else ''
+    print(f"[{int(match.clock):>3}'] {summary}{lag}", flush=True)
+
+
+def run(source, match, team_out, player_out, publish_interval=0.5):
+    """Apply each event as it arrives and republish at most every publish_interval.
+
+    Sources yield None while idle, so pending updates are flushed once the
+    interval has passed even if no further event arrives.
+    """
+    last_publish = 0.0
+    pending_since = None  # arrival of the oldest unpublished event
+    for ev in source:
+        now = time.monotonic()
+        if ev is not None:
+            match.update(ev)
+            if pending_since is None:
+                pending_since = now
+        if pending_since is not None and now - last_publish >= publish_interval:
+            publish(match, team_out, player_out, pending_since)
+            last_publish = time.monotonic()
+            pending_since = None
+    publish(match, team_out, player_out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live team metrics from a growing events feed.")
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument("--follow", help="JSON-lines file of events to tail (one event per line)")
+    src.add_argument("--replay", type=int, help="Replay events/<match_id>.json at match pace")
+    parser.add_argument("--match-id", default=None, help="Match id for --follow (default: file name)")
+    parser.add_argument("--speed", type=float, default=1.0, help="Replay speed multiplier (0 = no pacing)")
+    parser.add_argument("--idle-timeout", type=float, default=None,
+                        help="Stop following after this many seconds without new events")
+    parser.add_argument("--publish-interval", type=float, default=0.5, help="Seconds between publishes")
+    parser.add_argument("--out", default=str(OUT_TEAM_CSV), help="Team metrics CSV")
+    parser.add_argument("--players-out", default=str(OUT_PLAYER_CSV), help="Player minutes CSV")
+    args = parser.parse_args()
+
+    if args.follow:
+        path = Path(args.follow)
+        match = LiveMatch(args.match_id or path.stem)
+        source = follow_jsonl(path, idle_timeout=args.idle_timeout)
+    else:
+        match = LiveMatch(args.replay)
+        source = replay_events(args.replay, args.speed)
+
+    try:
+        run(source, match, Path(args.out), Path(args.players_out), args.publish_interval)
+    except KeyboardInterrupt:
+        publish(match, Path(args.out), Path(args.players_out))
+    print(f'Processed {match.events} events; saved {args.out} and {args.players_out}')
+
+    diff = compare_lineup_minutes(match)
+    if diff is not None:
+        if diff.empty:
+            print('Player minutes match the lineup file.')
+        else:
+            print('Player minutes differing from the lineup file (sent-off players are expected):')
+            print(diff.to_string(index=False, float_format=lambda v: f'{v:.2f}'))
+
+
+if __name__ == '__main__':
+    main()
@@ -3,10 +3,14 @@ from pathlib import Path
 import pandas as pd
 import unicodedata
 
+from statsbomb_decode import load_events
+
 BASE = Path('data/statsbomb_open_data')
 EVENTS_DIR = BASE / 'events'
 LINEUPS_DIR = BASE / 'lineups'
-MATCHES_PATH = BASE / 'matches' / '11_90.json'
+MATCHES_DIR = BASE / 'matches'
+MATCHES_PATH = MATCHES_DIR / '11_90.json'
+MATCH_STATS_CSV = Path('statsbomb_team_match_stats.csv')
 
 TARGET_TEAMS = [
     'Barcelona', 'Real Madrid', 'Atletico Madrid',
@@ -22,127 +26,257 @@ def collect_match_ids():
     matches = load_json(MATCHES_PATH)
     return [m['match_id'] for m in matches]
 
+
+def collect_all_match_ids():
+    """Match ids from every ingested competition that have events on disk."""
+    ids = []
+    for path in sorted(MATCHES_DIR.glob('*.json')):
+        for m in load_json(path):
+            if (EVENTS_DIR / f"{m['match_id']}.json").exists():
+                ids.append(m['match_id'])
+    return ids
+
 def normalize_name(name: str) -> str:
     if name is None:
         return ''
     return ''.join(c for c in unicodedata.normalize('NFKD', name) if ord(c) < 128)
 
-def is_progressive(start_x, end_x, min_gain=10):
+# Default zone definitions (StatsBomb pitch is 120 x 80).
+# scripts/statsbomb_threshold_sweep.py evaluates alternatives to these.
+MIN_PROGRESSIVE_GAIN = 10
+FINAL_THIRD_X = 80
+BOX = (102, 18, 62)  # x_min, y_min, y_max
+# PPDA zone: the opponent's own 60% of the pitch. Coordinates are from the
+# acting team's perspective, so that is x < 72 for the opponent's passes and
+# x >= 48 for the pressing team's defensive actions.
+PPDA_BUILDUP_MAX_X = 72
+PPDA_DEFENCE_MIN_X = 48
+
+def parse_time(value, fallback=0.0):
+    if value is None:
+        return fallback
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        if ':' in value:
+            parts = value.split(':')
+            try:
+                mins = float(parts[0])
+                secs = float(parts[1]) if len(parts) > 1 else 0.0
+                return mins + (secs / 60.0)
+            except ValueError:
+                return fallback
+        try:
+            return float(value)
+        except ValueError:
+            return fallback
+    return fallback
+
+
+def event_minute(ev):
+    """Event time on the StatsBomb minute/second clock (lineup spells use it too)."""
+    if ev.minute is None:
+        return None
+    return float(ev.minute) + (float(ev.second or 0) / 60.0)
+
+
+def events_end_minute(events):
+    """Last event time in minutes (at least 90); open lineup spells end here."""
+    max_min = 90.0
+    for ev in events:
+        t = event_minute(ev)
+        if t is not None and t > max_min:
+            max_min = t
+    return max_min
+
+
+def spell_minutes(positions, end_min):
+    """Minutes over a lineup entry's position spells (from/to minutes)."""
+    total = 0.0
+    for pos in positions or []:
+        start = parse_time(pos.from_, 0.0)
+        end = parse_time(pos.to, None)
+        if end is None:
+            end = end_min
+        total += max(0.0, float(end) - float(start))
+    return total
+
+def is_progressive(start_x, end_x, min_gain=MIN_PROGRESSIVE_GAIN):
     if start_x is None or end_x is None:
         return False
     return (end_x - start_x) >= min_gain
 
-def is_final_third_entry(end_x):
-    return end_x is not None and end_x >= 80
+def is_final_third_entry(end_x, min_x=FINAL_THIRD_X):
+    return end_x is not None and end_x >= min_x
 
-def is_box_entry(end_x, end_y):
+def is_box_entry(end_x, end_y, box=BOX):
     if end_x is None or end_y is None:
         return False
-    return end_x >= 102 and 18 <= end_y <= 62
+    x_min, y_min, y_max = box
+    return end_x >= x_min and y_min <= end_y <= y_max
 
 
-def build_team_stats(match_ids):
+# Counters mirrored onto the opponent as "<key>_Against".
+AGAINST_KEYS = [
+    'Shots', 'Goals', 'xG', 'Passes', 'Passes_Completed', 'Possession_Secs',
+    'Pressures', 'Tackles', 'Interceptions', 'Fouls', 'Dribbles',
+    'Dribbles_Success', 'Carries', 'Progressive_Passes', 'Progressive_Carries',
+    'FinalThird_Entries', 'Box_Entries', 'PPDA_Passes',
+]
+
+
+def new_counters():
+    """Per-event counters shared by the team and player aggregations."""
+    return {
+        'Shots': 0,
+        'Goals': 0,
+        'xG': 0.0,
+        'Passes': 0,
+        'Passes_Completed': 0,
+        'Possession_Secs': 0.0,
+        'Possession_Share_Sum': 0.0,
+        'Possession_Share_Count': 0,
+        'Pressures': 0,
+        'Tackles': 0,
+        'Interceptions': 0,
+        'Fouls': 0,
+        'Dribbles': 0,
+        'Dribbles_Success': 0,
+        'Carries': 0,
+        'Progressive_Passes': 0,
+        'Progressive_Carries': 0,
+        'FinalThird_Entries': 0,
+        'Box_Entries': 0,
+        'PPDA_Passes': 0,
+        'PPDA_Def_Actions': 0,
+    }
+
+
+def new_team_counters(team):
+    return {'Team': team, 'Matches': set(), **new_counters()}
+
+
+def count_ppda_action(s, ev):
+    loc = ev.location
+    if loc and loc[0] >= PPDA_DEFENCE_MIN_X:
+        s['PPDA_Def_Actions'] += 1
+
+
+def update_team_counters(team_stats, ev, mid):
+    """Add one event to its team's counters; returns the duration it adds to the match."""
+    team = ev.team.name if ev.team is not None else None
+    if not team:
+        return 0.0
+    s = team_stats.get(team)
+    if s is None:
+        s = team_stats[team] = new_team_counters(team)
+        s['Matches'].add(mid)
+
+    count_event(s, ev)
+
+    duration = ev.duration
+    if duration is None:
+        return 0.0
+    d = float(duration)
+    s['Possession_Secs'] += d
+    return d
+
+
+def count_event(s, ev):
+    """Apply one event's type-specific counts (shots, passes, carries, ...) to s."""
+    etype = ev.type.name if ev.type is not None else None
+    if etype == 'Shot':
+        s['Shots'] += 1
+        shot = ev.shot
+        if shot is not None:
+            if shot.outcome is not None and shot.outcome.name == 'Goal':
+                s['Goals'] += 1
+            if shot.statsbomb_xg is not None:
+                s['xG'] += float(shot.statsbomb_xg)
+    elif etype == 'Pass':
+        s['Passes'] += 1
+        p = ev.pass_
+        if p is None or p.outcome is None:
+            s['Passes_Completed'] += 1
+        loc = ev.location or [None, None]
+        end_loc = (p.end_location if p is not None else None) or [None, None]
+        if loc[0] is not None and loc[0] < PPDA_BUILDUP_MAX_X:
+            s['PPDA_Passes'] += 1
+        if is_progressive(loc[0], end_loc[0]):
+            s['Progressive_Passes'] += 1
+        if is_final_third_entry(end_loc[0]):
+            s['FinalThird_Entries'] += 1
+        if is_box_entry(end_loc[0], end_loc[1]):
+            s['Box_Entries'] += 1
+    elif etype == 'Pressure':
+        s['Pressures'] += 1
+    elif etype == 'Duel':
+        # StatsBomb has no Tackle event type; tackles are Duels of type Tackle
+        if ev.duel is not None and ev.duel.type is not None and ev.duel.type.name == 'Tackle':
+            s['Tackles'] += 1
+            count_ppda_action(s, ev)
+    elif etype == 'Interception':
+        s['Interceptions'] += 1
+        count_ppda_action(s, ev)
+    elif etype == 'Foul Committed':
+        s['Fouls'] += 1
+        count_ppda_action(s, ev)
+    elif etype == 'Dribble':
+        s['Dribbles'] += 1
+        dribble = ev.dribble
+        if dribble is not None and dribble.outcome is not None and dribble.outcome.name == 'Complete':
+            s['Dribbles_Success'] += 1
+    elif etype == 'Carry':
+        s['Carries'] += 1
+        loc = ev.location or [None, None]
+        end_loc = (ev.carry.end_location if ev.carry is not None else None) or [None, None]
+        if is_progressive(loc[0], end_loc[0]):
+            s['Progressive_Carries'] += 1
+        if is_final_third_entry(end_loc[0]):
+            s['FinalThird_Entries'] += 1
+        if is_box_entry(end_loc[0], end_loc[1]):
+            s['Box_Entries'] += 1
+
+
+def match_rows(team_stats, mid, match_total_duration):
+    """Per-team rows for one match; team_stats is left untouched."""
+    rows = []
+    for team, s in team_stats.items():
+        row = dict(s)
+        # Each team's counters are the opponent's "against" counters, so the
+        # defensive side comes out of the same pass over the events.
+        opp = next((o for t, o in team_stats.items() if t != team), None)
+        for key in AGAINST_KEYS:
+            row[f'{key}_Against'] = opp[key] if opp is not None else 0
+
+        row['Match_Id'] = mid
+        row['Matches'] = len(s['Matches'])
+        if match_total_duration > 0:
+            row['Possession_Share_Sum'] += s['Possession_Secs'] / match_total_duration
+            row['Possession_Share_Count'] += 1
+        rows.append(row)
+    return rows
+
+
+def build_match_stats(match_ids):
+    """One row per team per match (the partials aggregated by build_team_stats)."""
     rows = []
     for mid in match_ids:
         events_path = EVENTS_DIR / f"{mid}.json"
         if not events_path.exists():
             continue
-        events = load_json(events_path)
 
         team_stats = {}
         match_total_duration = 0.0
-        for ev in events:
-            team = ev.get('team', {}).get('name')
-            if not team:
-                continue
-            s = team_stats.setdefault(team, {
-                'Team': team,
-                'Matches': set(),
-                'Shots': 0,
-                'Goals': 0,
-                'xG': 0.0,
-                'Passes': 0,
-                'Passes_Completed': 0,
-                'Possession_Secs': 0.0,
-                'Possession_Share_Sum': 0.0,
-                'Possession_Share_Count': 0,
-                'Pressures': 0,
-                'Tackles': 0,
-                'Interceptions': 0,
-                'Fouls': 0,
-                'Dribbles': 0,
-                'Dribbles_Success': 0,
-                'Carries': 0,
-                'Progressive_Passes': 0,
-                'Progressive_Carries': 0,
-                'FinalThird_Entries': 0,
-                'Box_Entries': 0,
-            })
-            s['Matches'].add(mid)
-
-            etype = ev.get('type', {}).get('name')
-            if etype == 'Shot':
-                s['Shots'] += 1
-                shot = ev.get('shot', {})
-                if shot.get('outcome', {}).get('name') == 'Goal':
-                    s['Goals'] += 1
-                xg = shot.get('statsbomb_xg')
-                if xg is not None:
-                    s['xG'] += float(xg)
-            elif etype == 'Pass':
-                s['Passes'] += 1
-                if ev.get('pass', {}).get('outcome') is None:
-                    s['Passes_Completed'] += 1
-                loc = ev.get('location') or [None, None]
-                end_loc = ev.get('pass', {}).get('end_location') or [None, None]
-                if is_progressive(loc[0], end_loc[0]):
-                    s['Progressive_Passes'] += 1
-                if is_final_third_entry(end_loc[0]):
-                    s['FinalThird_Entries'] += 1
-                if is_box_entry(end_loc[0], end_loc[1]):
-                    s['Box_Entries'] += 1
-            elif etype == 'Pressure':
-                s['Pressures'] += 1
-            elif etype == 'Tackle':
-                s['Tackles'] += 1
-            elif etype == 'Interception':
-                s['Interceptions'] += 1
-            elif etype == 'Foul Committed':
-                s['Fouls'] += 1
-            elif etype == 'Dribble':
-                s['Dribbles'] += 1
-                if ev.get('dribble', {}).get('outcome', {}).get('name') == 'Complete':
-                    s['Dribbles_Success'] += 1
-            elif etype == 'Carry':
-                s['Carries'] += 1
-                loc = ev.get('location') or [None, None]
-                end_loc = ev.get('carry', {}).get('end_location') or [None, None]
-                if is_progressive(loc[0], end_loc[0]):
-                    s['Progressive_Carries'] += 1
-                if is_final_third_entry(end_loc[0]):
-                    s['FinalThird_Entries'] += 1
-                if is_box_entry(end_loc[0], end_loc[1]):
-                    s['Box_Entries'] += 1
-
-            duration = ev.get('duration')
-            if duration is not None:
-                d = float(duration)
-                s['Possession_Secs'] += d
-                match_total_duration += d
-
-        for team, s in team_stats.items():
-            s['Matches'] = len(s['Matches'])
-            if match_total_duration > 0:
-                s['Possession_Share_Sum'] += s['Possession_Secs'] / match_total_duration
-                s['Possession_Share_Count'] += 1
-            rows.append(s)
-
-    df = pd.DataFrame(rows)
-    if df.empty:
-        return df
+        for ev in load_events(events_path):
+            match_total_duration += update_team_counters(team_stats, ev, mid)
+        rows.extend(match_rows(team_stats, mid, match_total_duration))
+
+    return pd.DataFrame(rows)
 
-    agg = df.groupby('Team', as_index=False).sum(numeric_only=True)
 
+def add_derived_metrics(agg):
+    """Per-match rates and ratios from summed counters (works on any row set)."""
     agg['Shots_per_match'] = agg['Shots'] / agg['Matches']
     agg['Goals_per_match'] = agg['Goals'] / agg['Matches']
     agg['xG_per_match'] = agg['xG'] / agg['Matches']
@@ -162,20 +296,47 @@ def build_team_stats(match_ids):
     agg['Goals_per_shot'] = agg['Goals'] / agg['Shots']
     agg['Possession_Share'] = agg['Possession_Share_Sum'] / agg['Possession_Share_Count']
 
+    agg['xGA_per_match'] = agg['xG_Against'] / agg['Matches']
+    agg['xG_diff_per_match'] = agg['xG_per_match'] - agg['xGA_per_match']
+    agg['Shots_Against_per_match'] = agg['Shots_Against'] / agg['Matches']
+    agg['Goals_Against_per_match'] = agg['Goals_Against'] / agg['Matches']
+    agg['Opp_Passes_per_match'] = agg['Passes_Against'] / agg['Matches']
+    agg['Box_Entries_Against_per_match'] = agg['Box_Entries_Against'] / agg['Matches']
+    agg['FinalThird_Entries_Against_per_match'] = agg['FinalThird_Entries_Against'] / agg['Matches']
+    agg['xGA_per_shot'] = agg['xG_Against'] / agg['Shots_Against']
+    # PPDA proxy: opponent passes in their own 60% per defensive action
+    # (tackles, interceptions, fouls) in that zone
+    agg['PPDA'] = agg['PPDA_Passes_Against'] / agg['PPDA_Def_Actions']
+    return agg
+
+
+def aggregate_team_stats(match_df):
+    if match_df.empty:
+        return match_df
+
+    agg = match_df.drop(columns='Match_Id').groupby('Team', as_index=False).sum(numeric_only=True)
+    agg = add_derived_metrics(agg)
     agg['Team_Normalized'] = agg['Team'].apply(normalize_name)
 
     return agg
 
 
+def build_team_stats(match_ids):
+    return aggregate_team_stats(build_match_stats(match_ids))
+
+
 def main():
     match_ids = collect_match_ids()
-    df = build_team_stats(match_ids)
+    match_df = build_match_stats(match_ids)
+    df = aggregate_team_stats(match_df)
     if df.empty:
         print('No data found in events.')
         return
 
     out_full = Path('statsbomb_team_stats.csv')
     df.to_csv(out_full, index=False)
+    # Per-match partials feed the bootstrap CIs (scripts/statsbomb_bootstrap_ci.py)
+    match_df.to_csv(MATCH_STATS_CSV, index=False)
 
     target_norm = set(normalize_name(t) for t in TARGET_TEAMS)
     target_df = df[df['Team_Normalized'].isin(target_norm)]
@@ -183,6 +344,7 @@ def main():
         target_df.to_csv('statsbomb_team_stats_targets.csv', index=False)
 
     print('Saved statsbomb_team_stats.csv')
+    print(f'Saved {MATCH_STATS_CSV}')
     print('Saved statsbomb_team_stats_targets.csv')
 
 
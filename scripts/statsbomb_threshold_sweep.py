@@ -0,0 +1,149 @@
+import argparse
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+from statsbomb_decode import load_events
+from statsbomb_team_report import (
+    EVENTS_DIR, MIN_PROGRESSIVE_GAIN, FINAL_THIRD_X, BOX,
+    collect_match_ids, normalize_name,
+)
+
+OUT_CSV = Path('statsbomb_threshold_sweep.csv')
+
+DEFAULT_MIN_GAINS = list(range(5, 26))
+DEFAULT_FINAL_THIRD = [70, 75, FINAL_THIRD_X, 85, 90]
+DEFAULT_BOXES = [(96, 14, 66), BOX, (108, 22, 58), (114, 30, 50)]
+
+PASS, CARRY = 0, 1
+
+
+def flatten_moves(match_ids):
+    """Single scan over the events: one row per pass/carry with its coordinates."""
+    team_index = {}
+    team_matches = {}
+    team_idx, kind, start_x, end_x, end_y = [], [], [], [], []
+
+    for mid in match_ids:
+        events_path = EVENTS_DIR / f"{mid}.json"
+        if not events_path.exists():
+            continue
+        for ev in load_events(events_path):
+            team = ev.team.name if ev.team is not None else None
+            if not team:
+                continue
+            t = team_index.setdefault(team, len(team_index))
+            team_matches.setdefault(team, set()).add(mid)
+
+            etype = ev.type.name if ev.type is not None else None
+            if etype == 'Pass':
+                k, end_loc = PASS, ev.pass_.end_location if ev.pass_ is not None else None
+            elif etype == 'Carry':
+                k, end_loc = CARRY, ev.carry.end_location if ev.carry is not None else None
+            else:
+                continue
+            loc = ev.location or [np.nan, np.nan]
+            end_loc = end_loc or [np.nan, np.nan]
+            team_idx.append(t)
+            kind.append(k)
+            start_x.append(loc[0])
+            end_x.append(end_loc[0])
+            end_y.append(end_loc[1])
+
+    teams = list(team_index)
+    return {
+        'teams': teams,
+        'matches': np.array([len(team_matches[t]) for t in teams], dtype=float),
+        'team_idx': np.array(team_idx, dtype=np.intp),
+        'kind': np.array(kind, dtype=np.int8),
+        'start_x': np.array(start_x, dtype=float),
+        'end_x': np.array(end_x, dtype=float),
+        'end_y': np.array(end_y, dtype=float),
+    }
+
+
+def team_totals(team_idx, n_teams, hits):
+    """Sum an (events x thresholds) boolean mask into (teams x thresholds)."""
+    out = np.zeros((n_teams, hits.shape[1]))
+    np.add.at(out, team_idx, hits)
+    return out
+
+
+def sweep(flat, min_gains, final_third_lines, boxes):
+    """Evaluate every threshold at once by broadcasting over the flattened moves.
+
+    Returns a long DataFrame (Team x Metric x Threshold). NaN coordinates
+    compare False, matching the None checks in statsbomb_team_report.
+    """
+    n_teams = len(flat['teams'])
+    team_idx = flat['team_idx']
+    is_pass = (flat['kind'] == PASS)[:, None]
+    is_carry = (flat['kind'] == CARRY)[:, None]
+    ex = flat['end_x'][:, None]
+    ey = flat['end_y'][:, None]
+
+    gains = np.asarray(min_gains, dtype=float)
+    lines = np.asarray(final_third_lines, dtype=float)
+    bx = np.asarray(boxes, dtype=float).reshape(-1, 3)
+
+    with np.errstate(invalid='ignore'):
+        prog = (flat['end_x'] - flat['start_x'])[:, None] >= gains[None, :]
+        final_third = ex >= lines[None, :]
+        in_box = (ex >= bx[None, :, 0]) & (ey >= bx[None, :, 1]) & (ey <= bx[None, :, 2])
+
+    cube = [
+        ('Progressive_Passes', [f'min_gain={g:g}' for g in gains],
+         team_totals(team_idx, n_teams, prog & is_pass)),
+        ('Progressive_Carries', [f'min_gain={g:g}' for g in gains],
+         team_totals(team_idx, n_teams, prog & is_carry)),
+        ('FinalThird_Entries', [f'x>={x:g}' for x in lines],
+         team_totals(team_idx, n_teams, final_third)),
+        ('Box_Entries', [f'x>={b[0]:g},{b[1]:g}<=y<={b[2]:g}' for b in bx],
+         team_totals(team_idx, n_teams, in_box)),
+    ]
+
+    frames = []
+    for metric, labels, values in cube:
+        df = pd.DataFrame(values, columns=labels)
+        df.insert(0, 'Team', flat['teams'])
+        df = df.melt(id_vars='Team', var_name='Threshold', value_name='Value')
+        df.insert(1, 'Metric', metric)
+        frames.append(df)
+
+    out = pd.concat(frames, ignore_index=True)
+    matches = pd.Series(flat['matches'], index=flat['teams'])
+    out['Value_per_match'] = out['Value'] / out['Team'].map(matches)
+    out['Team_Normalized'] = out['Team'].apply(normalize_name)
+    return out
+
+
+def parse_box(value):
+    parts = [float(p) for p in value.split(':')]
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError('box must be x_min:y_min:y_max')
+    return tuple(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep progressive/zone thresholds in a single event scan.")
+    parser.add_argument("--min-gains", type=float, nargs='+', default=DEFAULT_MIN_GAINS,
+                        help=f"Progressive min_gain values (default 5..25, baseline {MIN_PROGRESSIVE_GAIN})")
+    parser.add_argument("--final-third", type=float, nargs='+', default=DEFAULT_FINAL_THIRD,
+                        help=f"Final-third x lines (baseline {FINAL_THIRD_X})")
+    parser.add_argument("--boxes", type=parse_box, nargs='+', default=DEFAULT_BOXES,
+                        help="Box rectangles as x_min:y_min:y_max (baseline %g:%g:%g)" % BOX)
+    parser.add_argument("--out", default=str(OUT_CSV), help="Output CSV")
+    args = parser.parse_args()
+
+    flat = flatten_moves(collect_match_ids())
+    if not flat['teams']:
+        print('No data found in events.')
+        return
+
+    df = sweep(flat, args.min_gains, args.final_third, args.boxes)
+    df.to_csv(args.out, index=False)
+    print(f'Saved {args.out} ({len(flat["teams"])} teams, {df["Threshold"].nunique()} thresholds)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+import argparse
+import hashlib
+from pathlib import Path
+import time
+import numpy as np
+import pandas as pd
+
+from statsbomb_decode import load_events, load_lineups
+from statsbomb_team_report import (
+    EVENTS_DIR, LINEUPS_DIR, collect_all_match_ids, count_event,
+    events_end_minute, new_counters, normalize_name, spell_minutes,
+)
+
+TEAM_STATS_CSV = Path('statsbomb_team_stats.csv')
+PLAYER_STATS_CSV = Path('statsbomb_player_stats.csv')
+INDEX_DIR = Path('data') / 'similarity'
+
+# Style vectors: rates and ratios only, so volume of matches/minutes doesn't
+# dominate the comparison.
+TEAM_FEATURES = [
+    'Possession_Share', 'Pass_Completion', 'Shots_per_match', 'xG_per_shot',
+    'Pressures_per_match', 'Interceptions_per_match', 'Fouls_per_match',
+    'Dribbles_per_match', 'Carries_per_match', 'Progressive_Passes_per_match',
+    'Progressive_Carries_per_match', 'FinalThird_Entries_per_match',
+    'Box_Entries_per_match', 'xGA_per_match', 'Shots_Against_per_match', 'PPDA',
+    # FBref-derived columns (flick_scout_full.csv from the scraper path)
+    'verticality_index', 'field_tilt_proxy', 'high_line_proxy',
+]
+
+PLAYER_COUNTERS = [
+    'Passes', 'Passes_Completed', 'Progressive_Passes', 'Carries',
+    'Progressive_Carries', 'FinalThird_Entries', 'Box_Entries', 'Dribbles',
+    'Shots', 'xG', 'Pressures', 'Tackles', 'Interceptions', 'Fouls',
+]
+PLAYER_FEATURES = [f'{c}_p90' for c in PLAYER_COUNTERS if c != 'Passes_Completed'] + ['Pass_Completion']
+
+MIN_PLAYER_MINUTES = 90
+
+
+def build_player_stats(match_ids):
+    """Per-player counters (count_event, as for teams) and lineup minutes."""
+    stats = {}
+    for mid in match_ids:
+        events_path = EVENTS_DIR / f"{mid}.json"
+        lineups_path = LINEUPS_DIR / f"{mid}.json"
+        if not events_path.exists() or not lineups_path.exists():
+            continue
+        events = load_events(events_path)
+
+        for ev in events:
+            player = ev.player.name if ev.player is not None else None
+            team = ev.team.name if ev.team is not None else None
+            if not player or not team:
+                continue
+            s = stats.get((player, team))
+            if s is None:
+                s = stats[(player, team)] = {**new_counters(), 'Minutes': 0.0}
+            count_event(s, ev)
+
+        end_min = events_end_minute(events)
+        for team_entry in load_lineups(lineups_path):
+            for p in team_entry.lineup or []:
+                key = (p.player_name, team_entry.team_name)
+                if key in stats:
+                    stats[key]['Minutes'] += spell_minutes(p.positions, end_min)
+
+    rows = [{'Player': p, 'Team': t, **{c: s[c] for c in PLAYER_COUNTERS + ['Minutes']}}
+            for (p, t), s in stats.items()]
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return df
+    nineties = df['Minutes'] / 90.0
+    for c in PLAYER_COUNTERS:
+        if c != 'Passes_Completed':
+            df[f'{c}_p90'] = df[c] / nineties
+    df['Pass_Completion'] = df['Passes_Completed'] / df['Passes']
+    df['Player_Normalized'] = df['Player'].apply(normalize_name)
+    return df
+
+
+def file_digest(path: Path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def inputs_fingerprint(match_ids) -> str:
+    """Digest of the event/lineup files behind the player stats (ids, sizes, mtimes)."""
+    h = hashlib.sha1()
+    for mid in sorted(match_ids):
+        for path in (EVENTS_DIR / f"{mid}.json", LINEUPS_DIR / f"{mid}.json"):
+            st = path.stat() if path.exists() else None
+            h.update(f'{path.name}:{st.st_size if st else -1}:{st.st_mtime_ns if st else -1};'.encode())
+    return h.hexdigest()
+
+
+class StyleIndex:
+    """Exact cosine nearest neighbours over z-scored style vectors.
+
+    Vectors are L2-normalised once at build time, so a query is a single
+    matrix-vector product plus argpartition; thousands of rows answer in
+    well under a millisecond without an approximate index.
+    """
+
+    def __init__(self, labels, features, vectors, mean, std, source_digest=''):
+        self.labels = np.asarray(labels, dtype=object)
+        self.features = list(features)
+        self.vectors = vectors
+        self.mean = mean
+        self.std = std
+        self.source_digest = source_digest
+        self._lookup = {normalize_name(l).lower(): i for i, l in enumerate(self.labels)}
+
+    @classmethod
+    def build(cls, df, label_col, features, source_digest=''):
+        features = [f for f in features if f in df.columns]
+        X = df[features].to_numpy(dtype=float, copy=True)
+        X[~np.isfinite(X)] = np.nan
+        mean = np.nanmean(X, axis=0)
+        std = np.nanstd(X, axis=0)
+        std[~(std > 0)] = 1.0
+        Z = np.nan_to_num((X - mean) / std)
+        norms = np.linalg.norm(Z, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return cls(df[label_col].to_numpy(), features, Z / norms, mean, std, source_digest)
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(path, labels=self.labels.astype(str), features=np.array(self.features),
+                 vectors=self.vectors, mean=self.mean, std=self.std,
+                 source_digest=np.array(self.source_digest))
+
+    @classmethod
+    def load(cls, path: Path):
+        with np.load(path) as z:
+            return cls(z['labels'], z['features'].tolist(), z['vectors'], z['mean'],
+                       z['std'], str(z['source_digest']))
+
+    def find(self, name):
+        key = normalize_name(name).lower()
+        if key in self._lookup:
+            return self._lookup[key]
+        matches = [i for label, i in self._lookup.items() if key in label]
+        if len(matches) == 1:
+            return matches[0]
+        if not matches:
+            raise KeyError(f'{name!r} not found in index')
+        candidates = ', '.join(self.labels[i] for i in matches[:10])
+        more = f' (+{len(matches) - 10} more)' if len(matches) > 10 else ''
+        raise KeyError(f'{name!r} is ambiguous: {candidates}{more}')
+
+    def query(self, name, k=5):
+        i = self.find(name)
+        sims = self.vectors @ self.vectors[i]
+        sims[i] = -np.inf
+        k = min(k, len(sims) - 1)
+        top = np.argpartition(-sims, k - 1)[:k] if k > 0 else np.array([], dtype=int)
+        top = top[np.argsort(-sims[top])]
+        return pd.DataFrame({'Name': self.labels[top], 'Similarity': sims[top]})
+
+
+def team_frame(source: Path):
+    return pd.read_csv(source), 'Team', TEAM_FEATURES
+
+
+def refresh_player_stats(source: Path, force=False):
+    """Re-derive the player stats CSV when the event/lineup files behind it change."""
+    match_ids = collect_all_match_ids()
+    fingerprint = inputs_fingerprint(match_ids)
+    fingerprint_path = INDEX_DIR / f'{source.stem}.inputs'
+    if (not force and source.exists() and fingerprint_path.exists()
+            and fingerprint_path.read_text() == fingerprint):
+        return
+    build_player_stats(match_ids).to_csv(source, index=False)
+    fingerprint_path.parent.mkdir(parents=True, exist_ok=True)
+    fingerprint_path.write_text(fingerprint)
+
+
+def player_frame(source: Path, min_minutes):
+    df = pd.read_csv(source)
+    df = df[df['Minutes'] >= min_minutes].copy()
+    df['Label'] = df['Player'] + ' (' + df['Team'] + ')'
+    return df, 'Label', PLAYER_FEATURES
+
+
+def load_or_build(kind, source: Path, min_minutes=MIN_PLAYER_MINUTES, rebuild=False):
+    """Reuse the persisted index unless the source stats file has changed.
+
+    Player stats are first re-derived if the event/lineup files behind them
+    changed (new or re-downloaded matches), which changes the CSV digest too.
+    """
+    suffix = f'_min{min_minutes:g}' if kind == 'player' else ''
+    index_path = INDEX_DIR / f'{kind}_{source.stem}{suffix}.npz'
+    if kind == 'player':
+        refresh_player_stats(source, rebuild)
+    if not rebuild and index_path.exists() and source.exists():
+        index = StyleIndex.load(index_path)
+        if index.source_digest == file_digest(source):
+            return index
+
+    if kind == 'team':
+        df, label_col, features = team_frame(source)
+    else:
+        df, label_col, features = player_frame(source, min_minutes)
+    index = StyleIndex.build(df, label_col, features, file_digest(source))
+    index.save(index_path)
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find teams or players with the most similar style.")
+    parser.add_argument("query", help="Team name, or player name (optionally 'Player (Team)')")
+    parser.add_argument("--kind", choices=['team', 'player'], default='team')
+    parser.add_argument("--source", default=None,
+                        help=f"Stats CSV (default {TEAM_STATS_CSV} / {PLAYER_STATS_CSV}; "
+                             "flick_scout_full.csv also works for teams)")
+    parser.add_argument("-k", type=int, default=5, help="Number of neighbours")
+    parser.add_argument("--min-minutes", type=float, default=MIN_PLAYER_MINUTES,
+                        help="Minimum minutes for players to be indexed")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Ignore the persisted index (and re-derive player stats from events)")
+    args = parser.parse_args()
+
+    default_source = TEAM_STATS_CSV if args.kind == 'team' else PLAYER_STATS_CSV
+    source = Path(args.source) if args.source else default_source
+    index = load_or_build(args.kind, source, args.min_minutes, args.rebuild)
+
+    try:
+        start = time.perf_counter()
+        result = index.query(args.query, args.k)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    except KeyError as e:
+        raise SystemExit(e.args[0])
+    print(f"Most similar to {index.labels[index.find(args.query)]} "
+          f"({len(index.labels)} {args.kind}s indexed, {elapsed_ms:.2f} ms):")
+    print(result.to_string(index=False, float_format=lambda v: f'{v:.3f}'))
+
+
+if __name__ == '__main__':
+    main()